@@ -16,9 +16,9 @@ class MyPartitionId():
     num: int
 
 
-def get_partition_id(topo_list, expr) -> MyPartitionId:
+def get_partition_id(topo_index, expr) -> MyPartitionId:
     # Partition nodes into groups of two
-    res = MyPartitionId(topo_list.index(expr)//2)
+    res = MyPartitionId(topo_index[id(expr)]//2)
     return res
 
 
@@ -31,8 +31,10 @@ def main():
     tm = TopoSortMapper()
     tm(y)
 
+    topo_index = {id(expr): i for i, expr in enumerate(tm.topological_order)}
+
     from functools import partial
-    pfunc = partial(get_partition_id, tm.topological_order)
+    pfunc = partial(get_partition_id, topo_index)
 
     # Find the partitions
     outputs = pt.DictOfNamedArrays({"out": y})
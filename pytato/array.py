@@ -390,6 +390,8 @@ class Array(Taggable):
     # A tuple of field names. Fields must be equality comparable and
     # hashable. Dicts of hashable keys and values are also permitted.
     _fields: ClassVar[Tuple[str, ...]] = ("tags",)
+    # Set on the first call to :meth:`__hash__`.
+    _hash_value: int
 
     __array_priority__ = 1  # disallow numpy arithmetic to take precedence
 
@@ -442,15 +444,24 @@ class Array(Taggable):
     def T(self) -> Array:
         return AxisPermutation(self, tuple(range(self.ndim)[::-1]))
 
-    @memoize_method
     def __hash__(self) -> int:
+        # Arrays are used as keys in every mapper cache. Store the hash in
+        # an attribute, which is cheaper to retrieve than a memoized method.
+        try:
+            return self._hash_value
+        except AttributeError:
+            pass
+
         attrs = []
         for field in self._fields:
             attr = getattr(self, field)
             if isinstance(attr, dict):
                 attr = frozenset(attr.items())
             attrs.append(attr)
-        return hash(tuple(attrs))
+
+        hash_value = hash(tuple(attrs))
+        self._hash_value = hash_value
+        return hash_value
 
     def __eq__(self, other: Any) -> bool:
         if self is other:
@@ -58,6 +58,34 @@ __doc__ = """
 """
 
 
+# {{{ index variables
+
+# Shared instances of the index variables ``_0, _1, ...`` used in the
+# expressions of the lowered :class:`~pytato.array.IndexLambda` nodes, grown
+# on demand.
+_INDEX_VARS: List[prim.Variable] = [prim.Variable(f"_{d}") for d in range(32)]
+
+
+def _get_index_var(d: int) -> prim.Variable:
+    """Returns the index variable ``_d``."""
+    if d >= len(_INDEX_VARS):
+        _INDEX_VARS.extend(prim.Variable(f"_{i}")
+                           for i in range(len(_INDEX_VARS), d + 1))
+    return _INDEX_VARS[d]
+
+
+_REDUCTION_VAR_0 = prim.Variable("_r0")
+
+
+def _get_index_vars(n: int) -> Tuple[prim.Variable, ...]:
+    """Returns the index variables ``_0, ..., _{n-1}``."""
+    if n > len(_INDEX_VARS):
+        _get_index_var(n - 1)
+    return tuple(_INDEX_VARS[:n])
+
+# }}}
+
+
 # {{{ preprocessing for codegen
 
 class CodeGenPreprocessor(CopyMapper):
@@ -100,8 +128,7 @@ class CodeGenPreprocessor(CopyMapper):
         if name is None:
             name = self.var_name_gen("_pt_in")
         return Placeholder(name=name,
-                shape=tuple(self.rec(s) if isinstance(s, Array) else s
-                            for s in expr.shape),
+                shape=self.rec_idx_or_size_tuple(expr.shape),
                 dtype=expr.dtype,
                 tags=expr.tags)
 
@@ -163,19 +190,23 @@ class CodeGenPreprocessor(CopyMapper):
 
         self.bound_arguments[name] = expr.data
         return Placeholder(name=name,
-                shape=tuple(self.rec(s) if isinstance(s, Array) else s
-                            for s in expr.shape),
+                shape=self.rec_idx_or_size_tuple(expr.shape),
                 dtype=expr.dtype,
                 tags=expr.tags)
 
     def map_stack(self, expr: Stack) -> Array:
 
-        def get_subscript(array_index: int) -> SymbolicIndex:
-            result = []
-            for i in range(expr.ndim):
-                if i != expr.axis:
-                    result.append(var(f"_{i}"))
-            return tuple(result)
+        # the subscript is the same for all stacked arrays
+        index_vars = _get_index_vars(expr.ndim)
+        subscript = index_vars[:expr.axis] + index_vars[expr.axis+1:]
+        axis_var = index_vars[expr.axis]
+
+        # Arrays that are stacked more than once share a binding, so that
+        # their expressions are only generated once.
+        array_to_binding_name: Dict[Array, str] = {}
+        for array in expr.arrays:
+            array_to_binding_name.setdefault(array,
+                                             f"_in{len(array_to_binding_name)}")
 
         # I = axis index
         #
@@ -186,21 +217,20 @@ class CodeGenPreprocessor(CopyMapper):
         #            ...
         #                _inNm1[_0, _1, ...] ...))
         for i in range(len(expr.arrays) - 1, -1, -1):
-            subarray_expr = var(f"_in{i}")[get_subscript(i)]
+            subarray_expr = var(array_to_binding_name[expr.arrays[i]])[subscript]
             if i == len(expr.arrays) - 1:
                 stack_expr = subarray_expr
             else:
                 from pymbolic.primitives import If, Comparison
-                stack_expr = If(Comparison(var(f"_{expr.axis}"), "==", i),
+                stack_expr = If(Comparison(axis_var, "==", i),
                         subarray_expr,
                         stack_expr)
 
-        bindings = {f"_in{i}": self.rec(array)
-                for i, array in enumerate(expr.arrays)}
+        bindings = {name: self.rec(array)
+                for array, name in array_to_binding_name.items()}
 
         return IndexLambda(expr=stack_expr,
-                shape=tuple(self.rec(s) if isinstance(s, Array) else s
-                            for s in expr.shape),
+                shape=self.rec_idx_or_size_tuple(expr.shape),
                 dtype=expr.dtype,
                 bindings=bindings,
                 tags=expr.tags)
@@ -208,11 +238,15 @@ class CodeGenPreprocessor(CopyMapper):
     def map_concatenate(self, expr: Concatenate) -> Array:
         from pymbolic.primitives import If, Comparison, Subscript
 
+        index_vars = _get_index_vars(expr.ndim)
+        axis_var = index_vars[expr.axis]
+
         def get_subscript(array_index: int, offset: ScalarExpression) -> Subscript:
             aggregate = var(f"_in{array_index}")
-            index = [var(f"_{i}") if i != expr.axis else (var(f"_{i}") - offset)
-                     for i in range(len(expr.shape))]
-            return Subscript(aggregate, tuple(index))
+            index = (index_vars[:expr.axis]
+                     + (axis_var - offset,)
+                     + index_vars[expr.axis+1:])
+            return Subscript(aggregate, index)
 
         lbounds: List[Any] = [0]
         ubounds: List[Any] = [expr.arrays[0].shape[expr.axis]]
@@ -236,8 +270,8 @@ class CodeGenPreprocessor(CopyMapper):
             if i == len(expr.arrays) - 1:
                 stack_expr = subarray_expr
             else:
-                stack_expr = If(Comparison(var(f"_{expr.axis}"), ">=", lbound)
-                                and Comparison(var(f"_{expr.axis}"), "<", ubound),
+                stack_expr = If(Comparison(axis_var, ">=", lbound)
+                                and Comparison(axis_var, "<", ubound),
                                 subarray_expr,
                                 stack_expr)
 
@@ -245,8 +279,7 @@ class CodeGenPreprocessor(CopyMapper):
                 for i, array in enumerate(expr.arrays)}
 
         return IndexLambda(expr=stack_expr,
-                shape=tuple(self.rec(s) if isinstance(s, Array) else s
-                            for s in expr.shape),
+                shape=self.rec_idx_or_size_tuple(expr.shape),
                 dtype=expr.dtype,
                 bindings=bindings,
                 tags=expr.tags)
@@ -255,7 +288,7 @@ class CodeGenPreprocessor(CopyMapper):
         from pytato.utils import dim_to_index_lambda_components
 
         index_expr = var("_in0")
-        indices = [var(f"_{d}") for d in range(expr.ndim)]
+        indices = list(_get_index_vars(expr.ndim))
         axis = expr.axis
         axis_len_expr, bindings = dim_to_index_lambda_components(
             expr.shape[axis],
@@ -280,17 +313,13 @@ class CodeGenPreprocessor(CopyMapper):
         from pytato.utils import dim_to_index_lambda_components
         from pytato.scalar_expr import Reduce
 
-        x1 = prim.Subscript(prim.Variable("in0"),
-                (tuple(prim.Variable(f"_{i}")
-                      for i in range(len(expr.x1.shape)-1))
-                 + (prim.Variable("_r0"),))
-                )
-        x2_i_start = len(expr.x1.shape) - 1
+        index_vars = _get_index_vars(expr.ndim)
+        x2_i_start = expr.x1.ndim - 1
 
+        x1 = prim.Subscript(prim.Variable("in0"),
+                index_vars[:x2_i_start] + (_REDUCTION_VAR_0,))
         x2 = prim.Subscript(prim.Variable("in1"),
-                (prim.Variable("_r0"),)
-                + tuple(prim.Variable(f"_{i+x2_i_start}")
-                        for i in range(len(expr.x2.shape)-1)))
+                (_REDUCTION_VAR_0,) + index_vars[x2_i_start:])
         namegen = UniqueNameGenerator({"in0", "in1"})
         redn_bound, redn_bound_bindings = dim_to_index_lambda_components(
                 expr.x1.shape[-1], namegen)
@@ -304,8 +333,7 @@ class CodeGenPreprocessor(CopyMapper):
                 {"_r0": (0, redn_bound)})
         return IndexLambda(
                 expr=inner_expr,
-                shape=tuple(self.rec(s) if isinstance(s, Array) else s
-                            for s in expr.shape),
+                shape=self.rec_idx_or_size_tuple(expr.shape),
                 dtype=expr.dtype,
                 bindings=bindings,
                 tags=expr.tags)
@@ -338,7 +366,7 @@ class CodeGenPreprocessor(CopyMapper):
                     continue
 
                 if isinstance(axis, ElementwiseAxis):
-                    subscript_indices.append(prim.Variable(f"_{axis.dim}"))
+                    subscript_indices.append(_get_index_var(axis.dim))
                 else:
                     assert isinstance(axis, ReductionAxis)
                     redn_idx_name = f"_r{axis.dim}"
@@ -388,8 +416,7 @@ class CodeGenPreprocessor(CopyMapper):
         array = self.rec(expr.array)
 
         return IndexLambda(expr=index_expr,
-                shape=tuple(self.rec(s) if isinstance(s, Array) else s
-                            for s in expr.shape),
+                shape=self.rec_idx_or_size_tuple(expr.shape),
                 dtype=expr.dtype,
                 bindings=dict(_in0=array),
                 tags=expr.tags)
@@ -397,7 +424,7 @@ class CodeGenPreprocessor(CopyMapper):
     def _indices_for_axis_permutation(self, expr: AxisPermutation) -> SymbolicIndex:
         indices = [None] * expr.ndim
         for from_index, to_index in enumerate(expr.axes):
-            indices[to_index] = var(f"_{from_index}")
+            indices[to_index] = _get_index_var(from_index)
         return tuple(indices)
 
     def _indices_for_reshape(self, expr: Reshape) -> SymbolicIndex:
@@ -411,8 +438,9 @@ class CodeGenPreprocessor(CopyMapper):
             assert isinstance(new_axis_len, int)
             newstrides.insert(0, newstrides[0]*new_axis_len)
 
-        flattened_idx = sum(prim.Variable(f"_{i}")*stride
-                            for i, stride in enumerate(newstrides))
+        flattened_idx = sum(index_var*stride
+                            for index_var, stride in zip(
+                                _get_index_vars(len(newstrides)), newstrides))
 
         oldstrides = [1]  # input array strides
         for axis_len in reversed(expr.array.shape[1:]):
@@ -453,7 +481,7 @@ class CodeGenPreprocessor(CopyMapper):
                     indices.append(idx % prim.Variable(bnd_name))
             elif isinstance(idx, NormalizedSlice):
                 indices.append(idx.start
-                               + idx.step * prim.Variable(f"_{islice_idx}"))
+                               + idx.step * _get_index_var(islice_idx))
                 islice_idx += 1
             else:
                 raise NotImplementedError
@@ -493,7 +521,7 @@ class CodeGenPreprocessor(CopyMapper):
                     indices.append(idx % prim.Variable(bnd_name))
             elif isinstance(idx, NormalizedSlice):
                 indices.append(idx.start
-                               + idx.step * prim.Variable(f"_{islice_idx}"))
+                               + idx.step * _get_index_var(islice_idx))
                 islice_idx += 1
             elif isinstance(idx, Array):
                 if isinstance(axis_len, int):
@@ -549,7 +577,7 @@ class CodeGenPreprocessor(CopyMapper):
                     indices.append(idx % prim.Variable(bnd_name))
             elif isinstance(idx, NormalizedSlice):
                 indices.append(idx.start
-                               + idx.step * prim.Variable(f"_{islice_idx}"))
+                               + idx.step * _get_index_var(islice_idx))
                 islice_idx += 1
             elif isinstance(idx, Array):
                 if isinstance(axis_len, int):
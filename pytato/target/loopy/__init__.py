@@ -35,9 +35,11 @@ __doc__ = """
 """
 
 import sys
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, field
 
-from typing import Any, Mapping, Optional, Union, Callable
+from typing import (Any, Mapping, Optional, Union, Callable, Dict, Tuple,
+                    ClassVar)
 
 from pytato.target import Target, BoundProgram
 
@@ -92,15 +94,34 @@ class LoopyPyOpenCLTarget(LoopyTarget):
 class BoundPyOpenCLProgram(BoundProgram):
     """A wrapper around a :mod:`loopy` kernel for execution with :mod:`pyopencl`.
 
+    .. attribute:: specialize_shapes
+
+        If *True*, the values of the size parameters seen in a call are fixed
+        in the called entrypoint (via :func:`loopy.fix_parameters`) before it
+        is executed. Other kernels of the translation unit are left as is. The
+        most recently used specialized programs are cached per entrypoint and
+        tuple of size parameter values, so that repeated calls with the same
+        shapes reuse the same compiled kernel.
+
     .. automethod:: __call__
+    .. automethod:: get_specialized_program
     .. automethod:: copy
     .. automethod:: with_transformed_program
     """
+    specialize_shapes: bool = False
+    # Maximum number of shape-specialized programs kept alive by a bound
+    # program, the least recently used one is evicted beyond this.
+    _max_specialized_programs: ClassVar[int] = 16
+    _specialized_programs: OrderedDict[Tuple[str, Tuple[Tuple[str, int], ...]],
+                                       loopy.TranslationUnit] = field(
+                                               init=False,
+                                               default_factory=OrderedDict)
 
     def copy(self, *,
              program: Optional[loopy.TranslationUnit] = None,
              bound_arguments: Optional[Mapping[str, Any]] = None,
-             target: Optional[Target] = None
+             target: Optional[Target] = None,
+             specialize_shapes: Optional[bool] = None,
              ) -> BoundPyOpenCLProgram:
         if program is None:
             program = self.program
@@ -111,9 +132,13 @@ class BoundPyOpenCLProgram(BoundProgram):
         if target is None:
             target = self.target
 
+        if specialize_shapes is None:
+            specialize_shapes = self.specialize_shapes
+
         return BoundPyOpenCLProgram(program=program,
                                     bound_arguments=bound_arguments,
-                                    target=target)
+                                    target=target,
+                                    specialize_shapes=specialize_shapes)
 
     def with_transformed_program(self, f: Callable[[loopy.TranslationUnit],
                                                    loopy.TranslationUnit]
@@ -136,18 +161,90 @@ class BoundPyOpenCLProgram(BoundProgram):
         updated_kwargs = dict(self.bound_arguments)
         updated_kwargs.update(kwargs)
 
+        program = self.program
+        if self.specialize_shapes:
+            program = self._get_shape_specialized_program(updated_kwargs,
+                                                          entrypoint)
+
         # final DAG might be independent of certain placeholders, for ex.
         # '0 * x' results in a final loopy t-unit that is independent of the
         # array 'x', do not pass such inputs
         updated_kwargs = {kw: arg
                           for kw, arg in updated_kwargs.items()
-                          if kw in self.program.default_entrypoint.arg_dict}
+                          if kw in program[entrypoint].arg_dict}
 
-        return self.program(queue,
+        return program(queue,
                             allocator=allocator, wait_for=wait_for,
                             out_host=out_host, entrypoint=entrypoint,
                             **updated_kwargs)
 
+    def get_specialized_program(self, entrypoint: str = "_pt_kernel",
+                                **kwargs: Any) -> loopy.TranslationUnit:
+        """Returns the program executed by :meth:`__call__` for the arguments
+        *kwargs*. This is :attr:`program`, unless :attr:`specialize_shapes` is
+        *True*.
+        """
+        if not self.specialize_shapes:
+            return self.program
+
+        updated_kwargs = dict(self.bound_arguments)
+        updated_kwargs.update(kwargs)
+
+        return self._get_shape_specialized_program(updated_kwargs, entrypoint)
+
+    def _get_shape_specialized_program(self, kwargs: Mapping[str, Any],
+                                       entrypoint: str
+                                       ) -> loopy.TranslationUnit:
+        from pymbolic.primitives import Variable
+
+        if isinstance(self.program, loopy.LoopKernel):
+            knl = self.program
+        else:
+            knl = self.program[entrypoint]
+        size_params = {arg.name for arg in knl.args
+                       if isinstance(arg, loopy.ValueArg)}
+
+        values: Dict[str, int] = {}
+        for name in size_params:
+            if name in kwargs:
+                values[name] = int(kwargs[name])
+
+        # infer the remaining size parameters from the shapes of the arrays
+        for arg in knl.args:
+            if (not isinstance(arg, loopy.ArrayArg)
+                    or arg.name not in kwargs
+                    or not isinstance(arg.shape, tuple)):
+                continue
+
+            for dim, actual_dim in zip(arg.shape, kwargs[arg.name].shape):
+                if (isinstance(dim, Variable) and dim.name in size_params
+                        and dim.name not in values):
+                    values[dim.name] = int(actual_dim)
+
+        if not values:
+            return self.program
+
+        key = (entrypoint, tuple(sorted(values.items())))
+        try:
+            program = self._specialized_programs[key]
+        except KeyError:
+            # Only fix the parameters in the entrypoint: kernels called from it
+            # (e.g. via pytato.call_loopy) may have parameters of the same name
+            # that are passed different values.
+            knl = loopy.fix_parameters(knl, **values)
+            if isinstance(self.program, loopy.LoopKernel):
+                program = knl
+            else:
+                program = self.program.with_kernel(knl)
+
+            self._specialized_programs[key] = program
+            if len(self._specialized_programs) > self._max_specialized_programs:
+                self._specialized_programs.popitem(last=False)
+        else:
+            self._specialized_programs.move_to_end(key)
+
+        return program
+
     @property
     def kernel(self) -> "loopy.LoopKernel":
         if isinstance(self.program, loopy.LoopKernel):
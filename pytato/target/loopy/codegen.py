@@ -32,13 +32,14 @@ import re
 import pytato.scalar_expr as scalar_expr
 import pymbolic.primitives as prim
 from pymbolic import var
+from loopy.symbolic import IdentityMapper as LoopyIdentityMapper
 
 from typing import (Union, Optional, Mapping, Dict, Tuple, FrozenSet, Set,
-                    Any, List)
+                    Any, List, Iterable)
 
 
 from pytato.array import (Array, DictOfNamedArrays, ShapeType, IndexLambda,
-        SizeParam, Placeholder, NamedArray)
+        SizeParam, Placeholder, NamedArray, AbstractResultWithNamedArrays)
 
 from pytato.target import BoundProgram
 from pytato.target.loopy import LoopyPyOpenCLTarget, LoopyTarget
@@ -90,14 +91,63 @@ def loopy_substitute(expression: Any, variable_assigments: Mapping[str, Any]) ->
     return SubstitutionMapper(make_subst_func(variable_assigments))(expression)
 
 
+def loopy_rename_variables(expression: Any, name_map: Mapping[str, str]) -> Any:
+    """Rename the variables in *expression* according to *name_map*.
+
+    A specialization of :func:`loopy_substitute` for the case where all the
+    substitutions are variable renames.
+    """
+    # {{{ early exit for identity renames
+
+    if all(k == v for k, v in name_map.items()):
+        return expression
+
+    # }}}
+
+    return _LoopyVariableRenamer(name_map)(expression)
+
+
+# type-ignore-reason: loopy's IdentityMapper is untyped
+class _LoopyVariableRenamer(LoopyIdentityMapper):  # type: ignore[misc]
+    def __init__(self, name_map: Mapping[str, str]) -> None:
+        super().__init__()
+        self.name_map = name_map
+        self._cache: Dict[int, Tuple[Any, Any]] = {}
+
+    def __call__(self, expr: Any, *args: Any, **kwargs: Any) -> Any:
+        # Why choose id(x) as the cache key?
+        # - Inlined expressions may share sub-expressions, but only leaves are
+        #   ever rewritten. Identity suffices and avoids structural hashing.
+        # The mapped expression is stored alongside the result to keep it
+        # alive, so that its id cannot be reused by another expression.
+        try:
+            _, result = self._cache[id(expr)]
+            return result
+        except KeyError:
+            result = super().__call__(expr, *args, **kwargs)
+            self._cache[id(expr)] = (expr, result)
+            return result
+
+    rec = __call__
+
+    def map_variable(self, expr: prim.Variable) -> prim.Variable:
+        try:
+            return prim.Variable(self.name_map[expr.name])
+        except KeyError:
+            return expr
+
+
 # SymbolicIndex and ShapeType are semantically distinct but identical at the
 # type level.
 ReductionBounds = Mapping[str, Tuple[ScalarExpression, ScalarExpression]]
+_DomainSpace = Tuple[isl.Space,
+                     Tuple[Tuple[str, ...], Tuple[str, ...]],
+                     isl.LocalSpace,
+                     Dict[str, isl.Aff]]
 
 
 # {{{ LoopyExpressionContexts
 
-@dataclasses.dataclass(init=True, repr=False, eq=False)
 class PersistentExpressionContext(object):
     """
     Mutable state used while generating :mod:`loopy` expressions for a
@@ -120,16 +170,21 @@ class PersistentExpressionContext(object):
     .. automethod:: update_depends_on
 
     """
-    state: CodeGenState
-    _depends_on: FrozenSet[str] = \
-            dataclasses.field(default_factory=frozenset)
+    # One of these is created for every node during code generation, keep
+    # construction cheap.
+    __slots__ = ("state", "_depends_on")
+
+    def __init__(self, state: CodeGenState) -> None:
+        self.state = state
+        # accumulated in place, frozen only when queried
+        self._depends_on: Set[str] = set()
 
     @property
     def depends_on(self) -> FrozenSet[str]:
-        return self._depends_on
+        return frozenset(self._depends_on)
 
     def update_depends_on(self, other: FrozenSet[str]) -> None:
-        self._depends_on = self._depends_on | other
+        self._depends_on.update(other)
 
 
 @dataclasses.dataclass(frozen=True)
@@ -148,11 +203,19 @@ class LocalExpressionContext:
         The number of indices of the form ``_0``, ``_1``, allowed in the
         expression.
 
+    .. attribute:: result_cache
+
+        A mapping from names in :attr:`local_namespace` to the
+        :class:`ImplementedResult` generated for the bound array. Shared by
+        copies of the context that keep the same :attr:`local_namespace`.
+
     .. automethod:: lookup
     """
     num_indices: int
     local_namespace: Mapping[str, Array]
     reduction_bounds: ReductionBounds
+    result_cache: Dict[str, ImplementedResult] = dataclasses.field(
+            default_factory=dict, compare=False, repr=False)
 
     def lookup(self, name: str) -> Array:
         return self.local_namespace[name]
@@ -166,11 +229,15 @@ class LocalExpressionContext:
             reduction_bounds = self.reduction_bounds
         if num_indices is None:
             num_indices = self.num_indices
-        if local_namespace is None:
+        if local_namespace is None or local_namespace is self.local_namespace:
             local_namespace = self.local_namespace
+            result_cache = self.result_cache
+        else:
+            result_cache = {}
         return LocalExpressionContext(reduction_bounds=reduction_bounds,
                                       num_indices=num_indices,
-                                      local_namespace=local_namespace)
+                                      local_namespace=local_namespace,
+                                      result_cache=result_cache)
 
 # }}}
 
@@ -211,15 +278,16 @@ class StoredResult(ImplementedResult):
         self.name = name
         self.num_indices = num_indices
         self.depends_on = depends_on
+        self._var = prim.Variable(name)
 
     def to_loopy_expression(self, indices: SymbolicIndex,
             expr_context: PersistentExpressionContext) -> ScalarExpression:
         assert len(indices) == self.num_indices
         expr_context.update_depends_on(self.depends_on)
-        if indices == ():
-            return prim.Variable(self.name)
+        if not indices:
+            return self._var
         else:
-            return prim.Variable(self.name)[indices]
+            return self._var[indices]
 
 # }}}
 
@@ -242,9 +310,16 @@ class InlinedResult(ImplementedResult):
     def to_loopy_expression(self, indices: SymbolicIndex,
             expr_context: PersistentExpressionContext) -> ScalarExpression:
         assert len(indices) == self.num_indices
-        substitutions = {f"_{d}": i for d, i in enumerate(indices)}
         expr_context.update_depends_on(self.depends_on)
-        return loopy_substitute(self.expr, substitutions)
+        if all(isinstance(i, prim.Variable) for i in indices):
+            # type-ignore-reason: loopy_rename_variables returns Any
+            return loopy_rename_variables(  # type: ignore[no-any-return]
+                    self.expr,
+                    {f"_{d}": i.name  # type: ignore
+                     for d, i in enumerate(indices)})
+        else:
+            substitutions = {f"_{d}": i for d, i in enumerate(indices)}
+            return loopy_substitute(self.expr, substitutions)
 
 # }}}
 
@@ -278,6 +353,10 @@ class CodeGenState:
     .. attribute:: insn_id_gen
 
     .. automethod:: update_kernel
+    .. automethod:: add_kernel_args
+    .. automethod:: add_kernel_domains
+    .. automethod:: add_kernel_instructions
+    .. automethod:: add_kernel_temporaries
     """
     _program: Union["lp.TranslationUnit", lp.LoopKernel]
     results: Dict[Array, ImplementedResult]
@@ -285,6 +364,31 @@ class CodeGenState:
     var_name_gen: pytools.UniqueNameGenerator = dataclasses.field(init=False)
     insn_id_gen: pytools.UniqueNameGenerator = dataclasses.field(init=False)
 
+    # Additions to the entry kernel are accumulated here and applied in a
+    # single kernel copy once the kernel is queried, to avoid copying the
+    # kernel for every node in the graph.
+    _pending_args: List[lp.KernelArgument] = \
+            dataclasses.field(init=False, default_factory=list)
+    _pending_domains: List[isl.BasicSet] = \
+            dataclasses.field(init=False, default_factory=list)
+    _pending_instructions: List[lp.InstructionBase] = \
+            dataclasses.field(init=False, default_factory=list)
+    _pending_temporaries: Dict[str, lp.TemporaryVariable] = \
+            dataclasses.field(init=False, default_factory=dict)
+
+    # Caches used by :func:`domain_for_shape`, scoped to a single code
+    # generation run so that they are released along with the state.
+    _shape_dependencies_cache: Dict[ScalarExpression, FrozenSet[str]] = \
+            dataclasses.field(init=False, default_factory=dict)
+    _domain_space_cache: Dict[Tuple[Tuple[str, ...], FrozenSet[str]],
+                              _DomainSpace] = \
+            dataclasses.field(init=False, default_factory=dict)
+    # Spaces are keyed by their names, as equal instances of
+    # :class:`islpy.Space` do not necessarily hash equal.
+    _aff_cache: Dict[Tuple[Tuple[str, ...], Tuple[str, ...], ScalarExpression],
+                     isl.Aff] = \
+            dataclasses.field(init=False, default_factory=dict)
+
     def __post_init__(self) -> None:
         if isinstance(self._program, lp.LoopKernel):
             self.var_name_gen = self._program.get_var_name_generator()
@@ -296,6 +400,7 @@ class CodeGenState:
 
     @property
     def program(self) -> Union["lp.Program", lp.LoopKernel]:
+        self._apply_pending_kernel_updates()
         return self._program
 
     @property
@@ -303,17 +408,67 @@ class CodeGenState:
         """
         Returns the entry kernel of the loopy program being built.
         """
+        self._apply_pending_kernel_updates()
+        return self._get_kernel()
+
+    def _get_kernel(self) -> lp.LoopKernel:
         if isinstance(self._program, lp.LoopKernel):
             return self._program
         else:
             return self._program["_pt_kernel"]
 
+    def _apply_pending_kernel_updates(self) -> None:
+        if not (self._pending_args
+                or self._pending_domains
+                or self._pending_instructions
+                or self._pending_temporaries):
+            return
+
+        kernel = self._get_kernel()
+        temporary_variables = kernel.temporary_variables.copy()
+        temporary_variables.update(self._pending_temporaries)
+        kernel = kernel.copy(args=kernel.args + self._pending_args,
+                domains=kernel.domains + self._pending_domains,
+                instructions=kernel.instructions + self._pending_instructions,
+                temporary_variables=temporary_variables)
+
+        self._pending_args = []
+        self._pending_domains = []
+        self._pending_instructions = []
+        self._pending_temporaries = {}
+
+        self.update_kernel(kernel)
+
     def update_kernel(self, kernel: lp.LoopKernel) -> None:
         if isinstance(self._program, lp.LoopKernel):
             self._program = kernel
         else:
             self._program = self._program.with_kernel(kernel)
 
+    def add_kernel_args(self, args: Iterable[lp.KernelArgument]) -> None:
+        """Schedule *args* to be appended to the arguments of the entry kernel.
+        """
+        self._pending_args.extend(args)
+
+    def add_kernel_domains(self, domains: Iterable[isl.BasicSet]) -> None:
+        """Schedule *domains* to be appended to the domains of the entry kernel.
+        """
+        self._pending_domains.extend(domains)
+
+    def add_kernel_instructions(self,
+            instructions: Iterable[lp.InstructionBase]) -> None:
+        """Schedule *instructions* to be appended to the instructions of the
+        entry kernel.
+        """
+        self._pending_instructions.extend(instructions)
+
+    def add_kernel_temporaries(self,
+            temporaries: Mapping[str, lp.TemporaryVariable]) -> None:
+        """Schedule *temporaries* to be added to the temporary variables of the
+        entry kernel.
+        """
+        self._pending_temporaries.update(temporaries)
+
     def update_program(self, program: lp.Program) -> None:
         self._program = program
 
@@ -330,14 +485,27 @@ class CodeGenMapper(Mapper):
     def __init__(self) -> None:
         self.exprgen_mapper = InlinedExpressionGenMapper(self)
 
+    def rec(self,
+            expr: Union[Array, AbstractResultWithNamedArrays],
+            state: CodeGenState) -> Any:
+        # Consult the results of the code generation state prior to the
+        # method dispatch, as most visits in DAGs with shared sub-expressions
+        # are to already generated nodes. Results are only recorded for arrays,
+        # skip hashing the other nodes (e.g. an entire translation unit for
+        # LoopyCall).
+        if isinstance(expr, Array):
+            result = state.results.get(expr)
+            if result is not None:
+                return result
+
+        # type-ignore-reason: Mapper.rec is generic over a constrained
+        # type variable, which a Union cannot satisfy
+        return super().rec(expr, state)  # type: ignore[type-var]
+
     def map_size_param(self, expr: SizeParam,
             state: CodeGenState) -> ImplementedResult:
-        if expr in state.results:
-            return state.results[expr]
-
         arg = lp.ValueArg(expr.name, dtype=expr.dtype)
-        kernel = state.kernel.copy(args=state.kernel.args + [arg])
-        state.update_kernel(kernel)
+        state.add_kernel_args([arg])
         assert expr.name is not None
         result = StoredResult(expr.name, expr.ndim, frozenset())
         state.results[expr] = result
@@ -345,9 +513,6 @@ class CodeGenMapper(Mapper):
 
     def map_placeholder(self, expr: Placeholder,
             state: CodeGenState) -> ImplementedResult:
-        if expr in state.results:
-            return state.results[expr]
-
         shape = shape_to_scalar_expression(expr.shape, self, state)
 
         arg = lp.GlobalArg(expr.name,
@@ -357,8 +522,7 @@ class CodeGenMapper(Mapper):
                 offset=lp.auto,
                 is_input=True,
                 is_output=False)
-        kernel = state.kernel.copy(args=state.kernel.args + [arg])
-        state.update_kernel(kernel)
+        state.add_kernel_args([arg])
         assert expr.name is not None
         result = StoredResult(expr.name, expr.ndim, frozenset())
         state.results[expr] = result
@@ -366,9 +530,6 @@ class CodeGenMapper(Mapper):
 
     def map_index_lambda(self, expr: IndexLambda,
             state: CodeGenState) -> ImplementedResult:
-        if expr in state.results:
-            return state.results[expr]
-
         prstnt_ctx = PersistentExpressionContext(state)
         local_ctx = LocalExpressionContext(local_namespace=expr.bindings,
                                               num_indices=expr.ndim,
@@ -406,13 +567,11 @@ class CodeGenMapper(Mapper):
 
     def map_named_array(self, expr: NamedArray,
             state: CodeGenState) -> ImplementedResult:
-        if expr in state.results:
-            return state.results[expr]
-
         self.rec(expr._container, state)
 
-        assert expr in state.results
-        return state.results[expr]
+        result = state.results.get(expr)
+        assert result is not None
+        return result
 
     def map_loopy_call(self, expr: LoopyCall, state: CodeGenState) -> None:
         from loopy.kernel.instruction import make_assignment
@@ -432,7 +591,7 @@ class CodeGenMapper(Mapper):
             domains.append(domain_for_shape(inames,
                                             shape_to_scalar_expression(array.shape,
                                                                        self, state),
-                                            {}))
+                                            {}, state))
 
             inames_as_vars = tuple(var(iname) for iname in inames)
             return SubArrayRef(inames_as_vars,
@@ -516,15 +675,9 @@ class CodeGenMapper(Mapper):
                 id=new_insn_id)
 
         # update kernel
-        kernel = state.kernel
-        tvs = state.kernel.temporary_variables.copy()
-        tvs.update(new_tvs)
-
-        kernel = kernel.copy(instructions=kernel.instructions+[new_insn],
-                             temporary_variables=tvs,
-                             domains=kernel.domains+domains)
-
-        state.update_kernel(kernel)
+        state.add_kernel_instructions([new_insn])
+        state.add_kernel_temporaries(new_tvs)
+        state.add_kernel_domains(domains)
 
 # }}}
 
@@ -567,13 +720,31 @@ class InlinedExpressionGenMapper(scalar_expr.IdentityMapper):
                  ) -> ScalarExpression:
         return self.rec(expr, prstnt_ctx, local_ctx)
 
+    def _get_implemented_result(self, name: str,
+                                prstnt_ctx: PersistentExpressionContext,
+                                local_ctx: LocalExpressionContext
+                                ) -> ImplementedResult:
+        try:
+            return local_ctx.result_cache[name]
+        except KeyError:
+            pass
+
+        array = local_ctx.lookup(name)
+        # Bound arrays are most often generated already, skip the dispatch
+        # through the codegen mapper for those.
+        result = prstnt_ctx.state.results.get(array)
+        if result is None:
+            result = self.codegen_mapper(array, prstnt_ctx.state)
+        local_ctx.result_cache[name] = result
+        return result
+
     def map_subscript(self, expr: prim.Subscript,
                       prstnt_ctx: PersistentExpressionContext,
                       local_ctx: LocalExpressionContext,
                       ) -> ScalarExpression:
         assert isinstance(expr.aggregate, prim.Variable)
-        result: ImplementedResult = self.codegen_mapper(
-                local_ctx.lookup(expr.aggregate.name), prstnt_ctx.state)
+        result = self._get_implemented_result(
+                expr.aggregate.name, prstnt_ctx, local_ctx)
         return result.to_loopy_expression(self.rec(expr.index, prstnt_ctx,
                                                    local_ctx),
                                           prstnt_ctx)
@@ -593,9 +764,8 @@ class InlinedExpressionGenMapper(scalar_expr.IdentityMapper):
         elif expr.name in local_ctx.reduction_bounds:
             return expr
         else:
-            array = local_ctx.lookup(expr.name)
-            impl_result: ImplementedResult = self.codegen_mapper(array,
-                    prstnt_ctx.state)
+            impl_result = self._get_implemented_result(
+                    expr.name, prstnt_ctx, local_ctx)
             return impl_result.to_loopy_expression((), prstnt_ctx)
 
     def map_call(self, expr: prim.Call,
@@ -622,11 +792,15 @@ class InlinedExpressionGenMapper(scalar_expr.IdentityMapper):
                 old_name: state.var_name_gen(f"_pt_{expr.op}" + old_name)
                 for old_name in expr.bounds}
 
-        inner_expr = loopy_substitute(expr.inner_expr,
-                                      {k: prim.Variable(v)
-                                       for k, v in unique_names_mapping.items()})
-        new_bounds = {unique_names_mapping[name]: bound_exprs
-                      for name, bound_exprs in expr.bounds.items()}
+        if unique_names_mapping:
+            inner_expr = loopy_rename_variables(expr.inner_expr,
+                                                unique_names_mapping)
+            new_bounds = {unique_names_mapping[name]: bound_exprs
+                          for name, bound_exprs in expr.bounds.items()}
+        else:
+            # nothing to rename, no domain to add
+            inner_expr = expr.inner_expr
+            new_bounds = {}
 
         inner_expr = self.rec(inner_expr, prstnt_ctx,
                               local_ctx.copy(reduction_bounds=new_bounds))
@@ -640,11 +814,11 @@ class InlinedExpressionGenMapper(scalar_expr.IdentityMapper):
                                     tuple(unique_names_mapping.values()),
                                     inner_expr)
 
-        domain = domain_for_shape((), shape=(), reductions={
-            redn_iname: self.rec(bounds, prstnt_ctx, local_ctx)
-            for redn_iname, bounds in new_bounds.items()})
-        kernel = state.kernel
-        state.update_kernel(kernel.copy(domains=kernel.domains+[domain]))
+        if new_bounds:
+            domain = domain_for_shape((), shape=(), reductions={
+                redn_iname: self.rec(bounds, prstnt_ctx, local_ctx)
+                for redn_iname, bounds in new_bounds.items()}, state=state)
+            state.add_kernel_domains([domain])
 
         return inner_expr
 
@@ -657,6 +831,11 @@ def shape_to_scalar_expression(shape: ShapeType,
                                cgen_mapper: CodeGenMapper,
                                state: CodeGenState
                                ) -> Tuple[ScalarExpression, ...]:
+    if all(isinstance(dim, int) for dim in shape):
+        # Fully static shapes need not be generated. This is the common case,
+        # and also lets e.g. temporaries of equal shape share the tuple.
+        return shape  # type: ignore[return-value]
+
     shape_context = PersistentExpressionContext(state)
     result: List[ScalarExpression] = []
     for component in shape:
@@ -672,9 +851,79 @@ def shape_to_scalar_expression(shape: ShapeType,
     return tuple(result)
 
 
+def _get_shape_dependencies(expr: ScalarExpression,
+                            state: Optional[CodeGenState]) -> FrozenSet[str]:
+    # Shape and reduction bound expressions are shared across many arrays of a
+    # graph, cache to avoid walking them anew for every domain.
+    if state is None:
+        return scalar_expr.get_dependencies(expr)
+
+    try:
+        return state._shape_dependencies_cache[expr]
+    except KeyError:
+        result = scalar_expr.get_dependencies(expr)
+        state._shape_dependencies_cache[expr] = result
+        return result
+
+
+def _aff_from_expr(space: isl.Space,
+                   space_key: Tuple[Tuple[str, ...], Tuple[str, ...]],
+                   local_space: isl.LocalSpace,
+                   expr: ScalarExpression,
+                   state: Optional[CodeGenState]) -> isl.Aff:
+    if isinstance(expr, int):
+        # skip parsing the constant shapes
+        return isl.Aff.zero_on_domain(local_space) + expr
+
+    from loopy.symbolic import aff_from_expr
+    if state is None:
+        return aff_from_expr(space, expr)
+
+    key = (*space_key, expr)
+    try:
+        return state._aff_cache[key]
+    except KeyError:
+        result = aff_from_expr(space, expr)
+        state._aff_cache[key] = result
+        return result
+
+
+def _make_domain_space(set_names: Tuple[str, ...],
+                       param_names: FrozenSet[str]) -> _DomainSpace:
+    sorted_set_names = tuple(sorted(set_names))
+    sorted_param_names = tuple(sorted(param_names))
+
+    space = isl.Space.create_from_names(isl.DEFAULT_CONTEXT,
+            set=list(sorted_set_names),
+            params=list(sorted_param_names))
+    local_space = isl.LocalSpace.from_space(space)
+    affs = {name: isl.Aff.var_on_domain(local_space, isl.dim_type.set, i)
+            for i, name in enumerate(sorted_set_names)}
+
+    return space, (sorted_set_names, sorted_param_names), local_space, affs
+
+
+def _get_domain_space(set_names: Tuple[str, ...],
+                      param_names: FrozenSet[str],
+                      state: Optional[CodeGenState]) -> _DomainSpace:
+    # Arrays sharing the same size parameters recur often, cache to avoid
+    # sorting the names and rebuilding the space (and its variables) for each.
+    if state is None:
+        return _make_domain_space(set_names, param_names)
+
+    key = (set_names, param_names)
+    try:
+        return state._domain_space_cache[key]
+    except KeyError:
+        result = _make_domain_space(set_names, param_names)
+        state._domain_space_cache[key] = result
+        return result
+
+
 def domain_for_shape(dim_names: Tuple[str, ...],
          shape: Tuple[ScalarExpression, ...],
          reductions: Dict[str, Tuple[ScalarExpression, ScalarExpression]],
+         state: Optional[CodeGenState] = None,
          ) -> isl.BasicSet:  # noqa
     """Create an :class:`islpy.BasicSet` that expresses an appropriate index domain
     for an array of (potentially symbolic) shape *shape* having reduction
@@ -691,47 +940,52 @@ def domain_for_shape(dim_names: Tuple[str, ...],
     :arg reductions: A map from reduction inames to (lower, upper) bounds
         (as half-open integer ranges). The variables in the bounds become
         parameter dimensions in the returned set.
+
+    :arg state: If given, the :class:`CodeGenState` whose caches are used to
+        avoid recomputing the parts of the domain shared across calls.
     """
     assert len(dim_names) == len(shape)
 
     # Collect parameters.
     param_names_set: Set[str] = set()
-    for sdep in map(scalar_expr.get_dependencies, shape):
-        param_names_set |= sdep
+    param_names_set.update(*(_get_shape_dependencies(dim, state)
+                             for dim in shape))
 
     for bounds in reductions.values():
-        for sdep in map(scalar_expr.get_dependencies, bounds):
-            # FIXME: Assumes that reduction bounds are not data-dependent.
-            param_names_set |= sdep
-
-    set_names = sorted(tuple(dim_names) + tuple(reductions))
-    param_names = sorted(param_names_set)
+        # FIXME: Assumes that reduction bounds are not data-dependent.
+        param_names_set.update(*(_get_shape_dependencies(bound, state)
+                                 for bound in bounds))
 
     # Build domain.
-    dom = isl.BasicSet.universe(
-            isl.Space.create_from_names(isl.DEFAULT_CONTEXT,
-            set=set_names,
-            params=param_names))
+    space, space_key, local_space, affs = _get_domain_space(
+            tuple(dim_names) + tuple(reductions), frozenset(param_names_set),
+            state)
 
-    # Add constraints.
-    from loopy.symbolic import aff_from_expr
-    affs = isl.affs_from_space(dom.space)
+    # Collect constraints.
+    def aff_from_expr(expr: ScalarExpression) -> isl.Aff:
+        return _aff_from_expr(space, space_key, local_space, expr, state)
+
+    constraints: List[isl.Constraint] = []
 
     for iname, dim in zip(dim_names, shape):
-        dom &= affs[0].le_set(affs[iname])
-        dom &= affs[iname].lt_set(aff_from_expr(dom.space, dim))
+        # 0 <= iname < dim
+        constraints.append(isl.Constraint.inequality_from_aff(affs[iname]))
+        constraints.append(isl.Constraint.inequality_from_aff(
+            aff_from_expr(dim) - 1 - affs[iname]))
 
     for iname, (left, right) in reductions.items():
-        dom &= aff_from_expr(dom.space, left).le_set(affs[iname])
-        dom &= affs[iname].lt_set(aff_from_expr(dom.space, right))
+        # left <= iname < right
+        constraints.append(isl.Constraint.inequality_from_aff(
+            affs[iname] - aff_from_expr(left)))
+        constraints.append(isl.Constraint.inequality_from_aff(
+            aff_from_expr(right) - 1 - affs[iname]))
 
-    doms = dom.get_basic_sets()
+    # Adding all constraints to a single basic set at once avoids building
+    # (and coalescing) an intermediate set for every intersection.
+    dom = isl.BasicSet.universe(space).add_constraints(constraints)
 
-    if len(doms) == 0:
-        # empty set
-        dom = isl.BasicSet.empty(dom.get_space())
-    else:
-        dom, = doms
+    if dom.is_empty():
+        dom = isl.BasicSet.empty(space)
 
     return dom
 
@@ -791,18 +1045,12 @@ def add_store(name: str, expr: Array, result: ImplementedResult,
     shape = shape_to_scalar_expression(expr.shape, cgen_mapper, state)
 
     # Get the domain.
-    domain = domain_for_shape(inames, shape, {})
+    domain = domain_for_shape(inames, shape, {}, state)
 
     # Update the kernel.
-    kernel = state.kernel
-
     if output_to_temporary:
         tvar = get_loopy_temporary(name, expr, cgen_mapper, state)
-        temporary_variables = kernel.temporary_variables.copy()
-        temporary_variables[name] = tvar
-        kernel = kernel.copy(temporary_variables=temporary_variables,
-                domains=kernel.domains + [domain],
-                instructions=kernel.instructions + [insn])
+        state.add_kernel_temporaries({name: tvar})
     else:
         arg = lp.GlobalArg(name,
                 shape=shape,
@@ -810,11 +1058,11 @@ def add_store(name: str, expr: Array, result: ImplementedResult,
                 order="C",
                 is_input=False,
                 is_output=True)
-        kernel = kernel.copy(args=kernel.args + [arg],
-                domains=kernel.domains + [domain],
-                instructions=kernel.instructions + [insn])
+        state.add_kernel_args([arg])
+
+    state.add_kernel_domains([domain])
+    state.add_kernel_instructions([insn])
 
-    state.update_kernel(kernel)
     return insn_id
 
 
@@ -848,12 +1096,17 @@ def generate_loopy(result: Union[Array, DictOfNamedArrays, Dict[str, Array]],
         target: Optional[LoopyTarget] = None,
         options: Optional[lp.Options] = None,
         *,
-        cl_device: Optional["pyopencl.Device"] = None) -> BoundProgram:
+        cl_device: Optional["pyopencl.Device"] = None,
+        specialize_shapes: bool = False) -> BoundProgram:
     r"""Code generation entry point.
 
     :param result: Outputs of the computation.
     :param target: Code generation target.
     :param options: Code generation options for the kernel.
+    :param specialize_shapes: If *True*, the values of the size parameters
+        are fixed in the program on every call, allowing the generated code to
+        be specialized for the concrete shapes. See
+        :attr:`pytato.target.loopy.BoundPyOpenCLProgram.specialize_shapes`.
     :returns: A :class:`pytato.target.BoundProgram` wrapping the generated
         :mod:`loopy` program.
 
@@ -873,6 +1126,10 @@ def generate_loopy(result: Union[Array, DictOfNamedArrays, Dict[str, Array]],
         if cl_device is not None:
             raise TypeError("may not pass both 'target' and 'cl_device'")
 
+    if specialize_shapes and not isinstance(target, LoopyPyOpenCLTarget):
+        raise TypeError("'specialize_shapes' is only supported for "
+                f"pyopencl targets, got '{type(target).__name__}'")
+
     preproc_result = preprocess(orig_outputs, target)
     outputs = preproc_result.outputs
     compute_order = preproc_result.compute_order
@@ -919,10 +1176,17 @@ def generate_loopy(result: Union[Array, DictOfNamedArrays, Dict[str, Array]],
     # reduction iname collisions.
     program = lp.make_reduction_inames_unique(state.program)
 
-    return target.bind_program(
+    bound_program = target.bind_program(
             program=program,
             bound_arguments=preproc_result.bound_arguments)
 
+    if specialize_shapes:
+        from pytato.target.loopy import BoundPyOpenCLProgram
+        assert isinstance(bound_program, BoundPyOpenCLProgram)
+        bound_program = bound_program.copy(specialize_shapes=True)
+
+    return bound_program
+
 # }}}
 
 # vim:fdm=marker
@@ -26,7 +26,7 @@ THE SOFTWARE.
 
 from abc import ABC, abstractmethod
 from typing import (Any, Callable, Dict, FrozenSet, Union, TypeVar, Set, Generic,
-                    List, Mapping, Iterable, Optional, Tuple)
+                    List, Mapping, Iterable, Optional, Tuple, ClassVar)
 
 from pytato.array import (
         Array, IndexLambda, Placeholder, MatrixProduct, Stack, Roll,
@@ -38,13 +38,14 @@ from pytato.array import (
 from pytato.loopy import LoopyCall, LoopyCallResult
 from dataclasses import dataclass
 from pytato.tags import ImplStored
+from pytools import memoize_on_first_arg
 
 T = TypeVar("T", Array, AbstractResultWithNamedArrays)
 CombineT = TypeVar("CombineT")  # used in CombineMapper
 CachedMapperT = TypeVar("CachedMapperT")  # used in CachedMapper
 IndexOrShapeExpr = TypeVar("IndexOrShapeExpr")
 ArrayOrNames = Union[Array, AbstractResultWithNamedArrays]
-R = FrozenSet[Array]
+R = Set[Array]
 
 __doc__ = """
 .. currentmodule:: pytato.transform
@@ -63,6 +64,7 @@ __doc__ = """
 .. autoclass:: CachedMapAndCopyMapper
 .. autoclass:: EdgeCachedMapper
 .. autofunction:: copy_dict_of_named_arrays
+.. autofunction:: copy_dict_of_named_arrays_iterative
 .. autofunction:: get_dependencies
 .. autofunction:: map_and_copy
 .. autofunction:: materialize_with_mpms
@@ -80,6 +82,20 @@ class UnsupportedArrayError(ValueError):
     pass
 
 
+def _has_array_entries(situp: Tuple[IndexOrShapeExpr, ...]) -> bool:
+    for s in situp:
+        if isinstance(s, Array):
+            return True
+    return False
+
+
+_EMPTY_FROZENSET: FrozenSet[Any] = frozenset()
+
+
+def _is_same_sequence(new: Tuple[Any, ...], old: Tuple[Any, ...]) -> bool:
+    return new is old or all(n is o for n, o in zip(new, old))
+
+
 # {{{ mapper base class
 
 class Mapper:
@@ -96,9 +112,19 @@ class Mapper:
     .. automethod:: handle_unsupported_array
     .. automethod:: map_foreign
     .. automethod:: rec
+    .. automethod:: rec_iterative
     .. automethod:: __call__
     """
 
+    # maps types of expressions to the corresponding mapper methods of the
+    # class (or *None* if the class does not have such a method), filled
+    # lazily by :meth:`rec`
+    _mapper_method_table: ClassVar[Dict[type, Optional[Callable[..., Any]]]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._mapper_method_table = {}
+
     def handle_unsupported_array(self, expr: T, *args: Any, **kwargs: Any) -> Any:
         """Mapper method that is invoked for
         :class:`pytato.Array` subclasses for which a mapper
@@ -116,17 +142,47 @@ class Mapper:
 
     def rec(self, expr: T, *args: Any, **kwargs: Any) -> Any:
         """Call the mapper method of *expr* and return the result."""
-        method: Callable[..., Array]
+        method: Optional[Callable[..., Any]]
+        expr_type = type(expr)
 
         try:
-            method = getattr(self, expr._mapper_method)
-        except AttributeError:
+            method = self._mapper_method_table[expr_type]
+        except KeyError:
+            method_name = getattr(expr_type, "_mapper_method", None)
+            method = (getattr(type(self), method_name, None)
+                      if method_name is not None
+                      else None)
+            self._mapper_method_table[expr_type] = method
+
+        if method is None:
             if isinstance(expr, Array):
                 return self.handle_unsupported_array(expr, *args, **kwargs)
             else:
                 return self.map_foreign(expr, *args, **kwargs)
 
-        return method(expr, *args, **kwargs)
+        return method(self, expr, *args, **kwargs)
+
+    def rec_iterative(self, expr: T, *args: Any, **kwargs: Any) -> Any:
+        """Call :meth:`rec` on every node reachable from *expr*, such that each
+        node is mapped after all its predecessors, and return the result for
+        *expr*.
+
+        This is only meant for mappers that cache their results (e.g.
+        :class:`CachedMapper` or :class:`CombineMapper`): every call then finds
+        the results for the predecessors of the node in the cache, so that the
+        depth of the recursion does not grow with the depth of the DAG. For
+        such mappers, this is equivalent to :meth:`rec` if every node is mapped
+        independently of the path along which it is reached. Mappers that do
+        not cache (e.g. :class:`WalkMapper`) would instead map the entire
+        subgraph of every node again, taking quadratic time with unbounded
+        recursion.
+        """
+        result = None
+        for node in _get_topologically_sorted_nodes([expr]):
+            # type-ignore-reason: rec is typed with a TypeVar
+            result = self.rec(node, *args, **kwargs)  # type: ignore[type-var]
+
+        return result
 
     def __call__(self, expr: T, *args: Any, **kwargs: Any) -> Any:
         """Handle the mapping of *expr*."""
@@ -172,57 +228,122 @@ class CopyMapper(CachedMapper[ArrayOrNames]):
     .. note::
 
        This does not copy the data of a :class:`pytato.array.DataWrapper`.
+
+    .. note::
+
+       Nodes whose predecessors were all mapped to themselves are not
+       rebuilt, i.e. the parts of the graph that a subclass does not rewrite
+       are shared between the input and the result.
     """
 
     def rec_idx_or_size_tuple(self, situp: Tuple[IndexOrShapeExpr, ...]
                               ) -> Tuple[IndexOrShapeExpr, ...]:
+        # most shapes and indices are static, those can be reused as is
+        if not _has_array_entries(situp):
+            return situp
         return tuple(self.rec(s) if isinstance(s, Array) else s for s in situp)
 
+    def _rec_array_tuple(self, arrays: Tuple[Array, ...]) -> Tuple[Array, ...]:
+        """Returns *arrays* itself if all its entries map to themselves."""
+        new_arrays: Optional[List[Array]] = None
+        for i, ary in enumerate(arrays):
+            new_ary = self.rec(ary)
+            if new_arrays is None:
+                if new_ary is ary:
+                    continue
+                new_arrays = list(arrays[:i])
+            new_arrays.append(new_ary)
+
+        return arrays if new_arrays is None else tuple(new_arrays)
+
+    def _rec_bindings(self, bindings: Dict[str, Any]) -> Dict[str, Any]:
+        """Returns *bindings* itself if all its array values map to themselves.
+        Otherwise, a new :class:`dict` with sorted keys is returned.
+        """
+        items = sorted(bindings.items())
+        new_bindings: Optional[Dict[str, Any]] = None
+        for i, (name, subexpr) in enumerate(items):
+            new_subexpr = (self.rec(subexpr) if isinstance(subexpr, Array)
+                           else subexpr)
+            if new_bindings is None:
+                if new_subexpr is subexpr:
+                    continue
+                new_bindings = dict(items[:i])
+            new_bindings[name] = new_subexpr
+
+        return bindings if new_bindings is None else new_bindings
+
     def map_index_lambda(self, expr: IndexLambda) -> Array:
-        bindings: Dict[str, Array] = {
-                name: self.rec(subexpr)
-                for name, subexpr in sorted(expr.bindings.items())}
+        bindings = self._rec_bindings(expr.bindings)
+        shape = self.rec_idx_or_size_tuple(expr.shape)
+        if bindings is expr.bindings and _is_same_sequence(shape, expr.shape):
+            return expr
+
         return IndexLambda(expr=expr.expr,
-                shape=self.rec_idx_or_size_tuple(expr.shape),
+                shape=shape,
                 dtype=expr.dtype,
                 bindings=bindings,
                 tags=expr.tags)
 
     def map_placeholder(self, expr: Placeholder) -> Array:
         assert expr.name is not None
+        shape = self.rec_idx_or_size_tuple(expr.shape)
+        if _is_same_sequence(shape, expr.shape):
+            return expr
+
         return Placeholder(name=expr.name,
-                shape=self.rec_idx_or_size_tuple(expr.shape),
+                shape=shape,
                 dtype=expr.dtype,
                 tags=expr.tags)
 
     def map_matrix_product(self, expr: MatrixProduct) -> Array:
-        return MatrixProduct(x1=self.rec(expr.x1),
-                x2=self.rec(expr.x2),
-                tags=expr.tags)
+        x1 = self.rec(expr.x1)
+        x2 = self.rec(expr.x2)
+        if x1 is expr.x1 and x2 is expr.x2:
+            return expr
+
+        return MatrixProduct(x1=x1, x2=x2, tags=expr.tags)
 
     def map_stack(self, expr: Stack) -> Array:
-        arrays = tuple(self.rec(arr) for arr in expr.arrays)
+        arrays = self._rec_array_tuple(expr.arrays)
+        if arrays is expr.arrays:
+            return expr
+
         return Stack(arrays=arrays, axis=expr.axis, tags=expr.tags)
 
     def map_concatenate(self, expr: Concatenate) -> Array:
-        arrays = tuple(self.rec(arr) for arr in expr.arrays)
+        arrays = self._rec_array_tuple(expr.arrays)
+        if arrays is expr.arrays:
+            return expr
+
         return Concatenate(arrays=arrays, axis=expr.axis, tags=expr.tags)
 
     def map_roll(self, expr: Roll) -> Array:
-        return Roll(array=self.rec(expr.array),
+        array = self.rec(expr.array)
+        if array is expr.array:
+            return expr
+
+        return Roll(array=array,
                 shift=expr.shift,
                 axis=expr.axis,
                 tags=expr.tags)
 
     def map_axis_permutation(self, expr: AxisPermutation) -> Array:
-        return AxisPermutation(array=self.rec(expr.array),
+        array = self.rec(expr.array)
+        if array is expr.array:
+            return expr
+
+        return AxisPermutation(array=array,
                 axes=expr.axes,
                 tags=expr.tags)
 
     def _map_index_base(self, expr: IndexBase) -> Array:
-        return type(expr)(
-                array=self.rec(expr.array),
-                indices=self.rec_idx_or_size_tuple(expr.indices))
+        array = self.rec(expr.array)
+        indices = self.rec_idx_or_size_tuple(expr.indices)
+        if array is expr.array and _is_same_sequence(indices, expr.indices):
+            return expr
+
+        return type(expr)(array=array, indices=indices, tags=expr.tags)
 
     def map_basic_index(self, expr: BasicIndex) -> Array:
         return self._map_index_base(expr)
@@ -238,40 +359,58 @@ class CopyMapper(CachedMapper[ArrayOrNames]):
         return self._map_index_base(expr)
 
     def map_data_wrapper(self, expr: DataWrapper) -> Array:
+        shape = self.rec_idx_or_size_tuple(expr.shape)
+        if _is_same_sequence(shape, expr.shape):
+            return expr
+
         return DataWrapper(name=expr.name,
                 data=expr.data,
-                shape=self.rec_idx_or_size_tuple(expr.shape),
+                shape=shape,
                 tags=expr.tags)
 
     def map_size_param(self, expr: SizeParam) -> Array:
         assert expr.name is not None
-        return SizeParam(name=expr.name, tags=expr.tags)
+        return expr
 
     def map_einsum(self, expr: Einsum) -> Array:
-        return Einsum(expr.access_descriptors,
-                      tuple(self.rec(arg) for arg in expr.args),
-                      tags=expr.tags)
+        args = self._rec_array_tuple(expr.args)
+        if args is expr.args:
+            return expr
+
+        return Einsum(expr.access_descriptors, args, tags=expr.tags)
 
     def map_named_array(self, expr: NamedArray) -> Array:
-        return type(expr)(self.rec(expr._container), expr.name, tags=expr.tags)
+        container = self.rec(expr._container)
+        if container is expr._container:
+            return expr
+
+        return type(expr)(container, expr.name, tags=expr.tags)
 
     def map_dict_of_named_arrays(self,
             expr: DictOfNamedArrays) -> DictOfNamedArrays:
-        return DictOfNamedArrays({key: self.rec(val.expr)
-                                  for key, val in expr.items()})
+        data = {key: self.rec(val.expr) for key, val in expr.items()}
+        if all(data[key] is val.expr for key, val in expr.items()):
+            return expr
+
+        return DictOfNamedArrays(data)
 
     def map_loopy_call(self, expr: LoopyCall) -> LoopyCall:
-        bindings = {name: (self.rec(subexpr) if isinstance(subexpr, Array)
-                           else subexpr)
-                    for name, subexpr in sorted(expr.bindings.items())}
+        bindings = self._rec_bindings(expr.bindings)
+        if bindings is expr.bindings:
+            return expr
 
         return LoopyCall(translation_unit=expr.translation_unit,
                          bindings=bindings,
                          entrypoint=expr.entrypoint)
 
     def map_reshape(self, expr: Reshape) -> Array:
-        return Reshape(self.rec(expr.array),
-                       newshape=self.rec_idx_or_size_tuple(expr.newshape),
+        array = self.rec(expr.array)
+        newshape = self.rec_idx_or_size_tuple(expr.newshape)
+        if array is expr.array and _is_same_sequence(newshape, expr.newshape):
+            return expr
+
+        return Reshape(array,
+                       newshape=newshape,
                        order=expr.order,
                        tags=expr.tags)
 
@@ -286,6 +425,8 @@ class CombineMapper(Mapper, Generic[CombineT]):
 
     def rec_idx_or_size_tuple(self, situp: Tuple[IndexOrShapeExpr, ...]
                               ) -> Tuple[CombineT, ...]:
+        if not _has_array_entries(situp):
+            return ()
         return tuple(self.rec(s) for s in situp if isinstance(s, Array))
 
     def rec(self, expr: ArrayOrNames) -> CombineT:  # type: ignore
@@ -383,50 +524,87 @@ class DependencyMapper(CombineMapper[R]):
 
        This returns every node in the graph! Consider a custom
        :class:`CombineMapper` or a :class:`SubsetDependencyMapper` instead.
+
+    .. note::
+
+       The dependencies are accumulated in mutable sets held in the mapper's
+       cache. The sets returned by :meth:`rec` must not be modified,
+       :meth:`__call__` and :meth:`~Mapper.rec_iterative` return a
+       :class:`frozenset` copy.
     """
 
+    # type-ignore-reason: incompatible ret. type with super class
+    def __call__(self, expr: ArrayOrNames) -> FrozenSet[Array]:  # type: ignore
+        return frozenset(self.rec(expr))
+
+    def rec_iterative(self, expr: ArrayOrNames) -> FrozenSet[Array]:
+        # The cached sets are mutable, return a copy as in :meth:`__call__`.
+        # type-ignore-reason: Mapper.rec_iterative is typed with a TypeVar
+        return frozenset(super().rec_iterative(expr))  # type: ignore[type-var]
+
+    def rec(self, expr: ArrayOrNames) -> R:
+        try:
+            return self.cache[expr]
+        except KeyError:
+            pass
+
+        # type-ignore reason: type not compatible with super.rec() type
+        result: R = Mapper.rec(self, expr)  # type: ignore
+
+        # Inputs with static shapes are leaves of the DAG and cheaper to map
+        # than to store, keep them out of the cache.
+        if not (isinstance(expr, InputArgumentBase)
+                and not _has_array_entries(expr.shape)):
+            self.cache[expr] = result
+
+        return result
+
     def combine(self, *args: R) -> R:
-        from functools import reduce
-        return reduce(lambda a, b: a | b, args, frozenset())
+        return set().union(*args)
+
+    def _add_dependency(self, deps: R, expr: Array) -> R:
+        # *deps* is always a fresh set returned by :meth:`combine`
+        deps.add(expr)
+        return deps
 
     def map_index_lambda(self, expr: IndexLambda) -> R:
-        return self.combine(frozenset([expr]), super().map_index_lambda(expr))
+        return self._add_dependency(super().map_index_lambda(expr), expr)
 
     def map_placeholder(self, expr: Placeholder) -> R:
-        return self.combine(frozenset([expr]), super().map_placeholder(expr))
+        return self._add_dependency(super().map_placeholder(expr), expr)
 
     def map_data_wrapper(self, expr: DataWrapper) -> R:
-        return self.combine(frozenset([expr]), super().map_data_wrapper(expr))
+        return self._add_dependency(super().map_data_wrapper(expr), expr)
 
     def map_size_param(self, expr: SizeParam) -> R:
-        return frozenset([expr])
+        return {expr}
 
     def map_matrix_product(self, expr: MatrixProduct) -> R:
-        return self.combine(frozenset([expr]), super().map_matrix_product(expr))
+        return self._add_dependency(super().map_matrix_product(expr), expr)
 
     def map_stack(self, expr: Stack) -> R:
-        return self.combine(frozenset([expr]), super().map_stack(expr))
+        return self._add_dependency(super().map_stack(expr), expr)
 
     def map_roll(self, expr: Roll) -> R:
-        return self.combine(frozenset([expr]), super().map_roll(expr))
+        return self._add_dependency(super().map_roll(expr), expr)
 
     def map_axis_permutation(self, expr: AxisPermutation) -> R:
-        return self.combine(frozenset([expr]), super().map_axis_permutation(expr))
+        return self._add_dependency(super().map_axis_permutation(expr), expr)
 
     def _map_index_base(self, expr: IndexBase) -> R:
-        return self.combine(frozenset([expr]), super()._map_index_base(expr))
+        return self._add_dependency(super()._map_index_base(expr), expr)
 
     def map_reshape(self, expr: Reshape) -> R:
-        return self.combine(frozenset([expr]), super().map_reshape(expr))
+        return self._add_dependency(super().map_reshape(expr), expr)
 
     def map_concatenate(self, expr: Concatenate) -> R:
-        return self.combine(frozenset([expr]), super().map_concatenate(expr))
+        return self._add_dependency(super().map_concatenate(expr), expr)
 
     def map_einsum(self, expr: Einsum) -> R:
-        return self.combine(frozenset([expr]), super().map_einsum(expr))
+        return self._add_dependency(super().map_einsum(expr), expr)
 
     def map_named_array(self, expr: NamedArray) -> R:
-        return self.combine(frozenset([expr]), super().map_named_array(expr))
+        return self._add_dependency(super().map_named_array(expr), expr)
 
 # }}}
 
@@ -442,11 +620,15 @@ class SubsetDependencyMapper(DependencyMapper):
         self.universe = universe
         super().__init__()
 
-    def combine(self, *args: FrozenSet[Array]) -> FrozenSet[Array]:
-        from functools import reduce
-        return reduce(lambda acc, arg: acc | (arg & self.universe),
-                      args,
-                      frozenset())
+    def combine(self, *args: R) -> R:
+        result = set().union(*args)
+        result.intersection_update(self.universe)
+        return result
+
+    def _add_dependency(self, deps: R, expr: Array) -> R:
+        if expr in self.universe:
+            deps.add(expr)
+        return deps
 
 # }}}
 
@@ -460,14 +642,23 @@ class InputGatherer(CombineMapper[FrozenSet[InputArgumentBase]]):
     """
     def combine(self, *args: FrozenSet[InputArgumentBase]
                 ) -> FrozenSet[InputArgumentBase]:
-        from functools import reduce
-        return reduce(lambda a, b: a | b, args, frozenset())
+        if not args:
+            return _EMPTY_FROZENSET
+        return frozenset().union(*args)
+
+    def _combine_with_self(self, expr: InputArgumentBase,
+                           deps: FrozenSet[InputArgumentBase]
+                           ) -> FrozenSet[InputArgumentBase]:
+        # inputs mostly have static shapes, avoid an extra union for those
+        if not deps:
+            return frozenset((expr,))
+        return self.combine(frozenset((expr,)), deps)
 
     def map_placeholder(self, expr: Placeholder) -> FrozenSet[InputArgumentBase]:
-        return self.combine(frozenset([expr]), super().map_placeholder(expr))
+        return self._combine_with_self(expr, super().map_placeholder(expr))
 
     def map_data_wrapper(self, expr: DataWrapper) -> FrozenSet[InputArgumentBase]:
-        return self.combine(frozenset([expr]), super().map_data_wrapper(expr))
+        return self._combine_with_self(expr, super().map_data_wrapper(expr))
 
     def map_size_param(self, expr: SizeParam) -> FrozenSet[SizeParam]:
         return frozenset([expr])
@@ -484,8 +675,9 @@ class SizeParamGatherer(CombineMapper[FrozenSet[SizeParam]]):
     """
     def combine(self, *args: FrozenSet[SizeParam]
                 ) -> FrozenSet[SizeParam]:
-        from functools import reduce
-        return reduce(lambda a, b: a | b, args, frozenset())
+        if not args:
+            return _EMPTY_FROZENSET
+        return frozenset().union(*args)
 
     def map_size_param(self, expr: SizeParam) -> FrozenSet[SizeParam]:
         return frozenset([expr])
@@ -502,6 +694,12 @@ class WalkMapper(Mapper):
     Users may override the specific mapper methods in a derived class or
     override :meth:`WalkMapper.visit` and :meth:`WalkMapper.post_visit`.
 
+    .. note::
+
+       Shared sub-expressions are walked once per path that reaches them,
+       which can be exponential in the depth of the DAG. Use
+       :class:`CachedWalkMapper` to walk every node exactly once.
+
     .. automethod:: visit
     .. automethod:: post_visit
     """
@@ -667,13 +865,14 @@ class CachedWalkMapper(WalkMapper):
         #   structurally equal objects being walked separately (e.g. to detect
         #   separate instances of Placeholder with the same name).
 
-        if id(expr) in self._visited_ids:
+        key = id(expr)
+        if key in self._visited_ids:
             return
 
         # type-ignore reason: super().rec expects either 'Array' or
         # 'AbstractResultWithNamedArrays', passed 'ArrayOrNames'
         super().rec(expr)  # type: ignore
-        self._visited_ids.add(id(expr))
+        self._visited_ids.add(key)
 
 # }}}
 
@@ -910,12 +1109,138 @@ def copy_dict_of_named_arrays(source_dict: DictOfNamedArrays,
     return DictOfNamedArrays(data)
 
 
+def _array_entries(situp: Tuple[Any, ...]) -> Tuple[Array, ...]:
+    if not _has_array_entries(situp):
+        return ()
+    return tuple(s for s in situp if isinstance(s, Array))
+
+
+# Maps node types to functions returning the direct predecessors of a node in
+# the order in which :class:`CopyMapper` recurses into them. Subclasses are
+# resolved along their MRO by :func:`_get_children` and added lazily.
+_CHILDREN_GETTERS: Dict[type, Callable[[Any], Tuple[ArrayOrNames, ...]]] = {
+    IndexLambda: lambda expr: (
+        tuple(bnd for _, bnd in sorted(expr.bindings.items()))
+        + _array_entries(expr.shape)),
+    InputArgumentBase: lambda expr: _array_entries(expr.shape),
+    MatrixProduct: lambda expr: (expr.x1, expr.x2),
+    Stack: lambda expr: tuple(expr.arrays),
+    Concatenate: lambda expr: tuple(expr.arrays),
+    Roll: lambda expr: (expr.array,),
+    AxisPermutation: lambda expr: (expr.array,),
+    IndexBase: lambda expr: (expr.array,) + _array_entries(expr.indices),
+    Reshape: lambda expr: (expr.array,) + _array_entries(expr.newshape),
+    Einsum: lambda expr: tuple(expr.args),
+    NamedArray: lambda expr: (expr._container,),
+    DictOfNamedArrays: lambda expr: tuple(val.expr for val in expr.values()),
+    LoopyCall: lambda expr: tuple(bnd
+                                  for _, bnd in sorted(expr.bindings.items())
+                                  if isinstance(bnd, Array)),
+}
+
+
+def _get_children(expr: ArrayOrNames) -> Tuple[ArrayOrNames, ...]:
+    """Returns the direct predecessors of *expr* in the order in which
+    :class:`CopyMapper` recurses into them.
+    """
+    expr_type = type(expr)
+    try:
+        getter = _CHILDREN_GETTERS[expr_type]
+    except KeyError:
+        for base in expr_type.__mro__[1:]:
+            if base in _CHILDREN_GETTERS:
+                getter = _CHILDREN_GETTERS[base]
+                break
+        else:
+            raise UnsupportedArrayError(
+                    "cannot determine the predecessors of "
+                    f"'{expr_type.__name__}'")
+
+        _CHILDREN_GETTERS[expr_type] = getter
+
+    return getter(expr)
+
+
+def _get_topologically_sorted_nodes(roots: Iterable[ArrayOrNames]
+                                    ) -> List[ArrayOrNames]:
+    """Returns all the nodes reachable from *roots* (visited by identity) such
+    that every node appears after its predecessors. The traversal uses an
+    explicit stack, so that arbitrarily deep DAGs can be sorted.
+    """
+    visited_ids: Set[int] = set()
+    order: List[ArrayOrNames] = []
+
+    stack: List[Tuple[ArrayOrNames, bool]] = [
+            (root, False) for root in reversed(list(roots))]
+    while stack:
+        node, predecessors_done = stack.pop()
+        if predecessors_done:
+            order.append(node)
+            continue
+
+        if id(node) in visited_ids:
+            continue
+        visited_ids.add(id(node))
+
+        stack.append((node, True))
+        stack.extend((child, False)
+                     for child in reversed(_get_children(node))
+                     if id(child) not in visited_ids)
+
+    return order
+
+
+def copy_dict_of_named_arrays_iterative(source_dict: DictOfNamedArrays,
+        copy_mapper: CopyMapper) -> DictOfNamedArrays:
+    """Same as :func:`copy_dict_of_named_arrays`, but every node reachable
+    from *source_dict* is first mapped via :meth:`Mapper.rec_iterative`, which
+    bounds the depth of the recursion independently of the depth of the DAG.
+
+    .. note::
+
+        Since every reachable node is mapped on its own, this is only
+        equivalent to :func:`copy_dict_of_named_arrays` for mappers that do
+        not depend on the path along which a node is reached.
+    """
+    if not source_dict:
+        return DictOfNamedArrays({})
+
+    copy_mapper.rec_iterative(source_dict)
+    return copy_dict_of_named_arrays(source_dict, copy_mapper)
+
+
 def get_dependencies(expr: DictOfNamedArrays) -> Dict[str, FrozenSet[Array]]:
     """Returns the dependencies of each named array in *expr*.
-    """
-    dep_mapper = DependencyMapper()
 
-    return {name: dep_mapper(val.expr) for name, val in expr.items()}
+    The result is the same as that of a :class:`DependencyMapper`, but the
+    dependencies are computed as bitsets over the nodes of the DAG, which makes
+    combining the dependencies of predecessors a single integer operation.
+    The dependencies are memoized on *expr*.
+    """
+    return dict(_get_dependencies(expr))
+
+
+@memoize_on_first_arg
+def _get_dependencies(expr: DictOfNamedArrays) -> Dict[str, FrozenSet[Array]]:
+    nodes = _get_topologically_sorted_nodes(val.expr for val in expr.values())
+
+    id_to_deps: Dict[int, int] = {}
+    for i, node in enumerate(nodes):
+        # containers of named arrays are not dependencies themselves
+        deps = 0 if isinstance(node, AbstractResultWithNamedArrays) else 1 << i
+        for child in _get_children(node):
+            deps |= id_to_deps[id(child)]
+        id_to_deps[id(node)] = deps
+
+    def bitset_to_frozenset(deps: int) -> FrozenSet[Array]:
+        # bin() lists the bits from the most significant one, reverse it
+        # type-ignore-reason: containers never have their bit set
+        return frozenset(nodes[i]  # type: ignore[misc]
+                         for i, bit in enumerate(bin(deps)[:1:-1])
+                         if bit == "1")
+
+    return {name: bitset_to_frozenset(id_to_deps[id(val.expr)])
+            for name, val in expr.items()}
 
 
 def map_and_copy(expr: T,
@@ -85,6 +85,48 @@ def test_size_param(ctx_factory):
     assert n_out == 5
 
 
+def test_specialize_shapes(ctx_factory):
+    ctx = ctx_factory()
+    queue = cl.CommandQueue(ctx)
+
+    n = pt.make_size_param(name="n")
+    x = pt.make_placeholder(name="x", shape=(n,), dtype=np.float64)
+    prog = pt.generate_loopy(2*x, cl_device=queue.device,
+                             specialize_shapes=True)
+    program = prog.program
+
+    for size in (5, 7, 5):
+        x_in = np.random.rand(size)
+        _, (out,) = prog(queue, x=x_in)
+        np.testing.assert_allclose(out, 2*x_in)
+
+    # specialization must not leak into the bound program
+    assert prog.program is program
+    assert "n" in prog.program.default_entrypoint.arg_dict
+
+    prog5 = prog.get_specialized_program(x=np.empty(5))
+    prog7 = prog.get_specialized_program(x=np.empty(7))
+    assert prog.get_specialized_program(x=np.empty(5)) is prog5
+    assert prog5 is not prog7
+
+    knl5 = prog5.default_entrypoint
+    assert "n" not in knl5.arg_dict
+    assert not knl5.all_params()
+
+    # specializations are evicted once enough other shapes were seen
+    for size in range(8, 108):
+        prog.get_specialized_program(x=np.empty(size))
+    assert prog.get_specialized_program(x=np.empty(5)) is not prog5
+
+    # other kernels of the translation unit keep their parameters
+    other_knl = lp.make_kernel("{[i]: 0<=i<n}", "y[i] = x[i]", name="other")
+    merged_prog = prog.with_transformed_program(
+        lambda t_unit: lp.merge([t_unit, other_knl]))
+    merged_prog5 = merged_prog.get_specialized_program(x=np.empty(5))
+    assert "n" not in merged_prog5["_pt_kernel"].arg_dict
+    assert "n" in merged_prog5["other"].arg_dict
+
+
 @pytest.mark.parametrize("x1_ndim", (1, 2))
 @pytest.mark.parametrize("x2_ndim", (1, 2))
 def test_matmul(ctx_factory, x1_ndim, x2_ndim):
@@ -427,6 +469,7 @@ def test_stack(ctx_factory, input_dims):
 
     for axis in range(0, 1 + input_dims):
         assert_allclose_to_numpy(pt.stack((x, y), axis=axis), queue)
+        assert_allclose_to_numpy(pt.stack((x, y, x), axis=axis), queue)
 
 
 def test_concatenate(ctx_factory):
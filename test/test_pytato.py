@@ -304,6 +304,107 @@ def test_toposortmapper():
     assert isinstance(tm.topological_order[6], MatrixProduct)
 
 
+def test_copy_dict_of_named_arrays_iterative():
+    from pytato.array import Placeholder
+    from pytato.transform import (CopyMapper, copy_dict_of_named_arrays,
+                                  copy_dict_of_named_arrays_iterative,
+                                  get_dependencies)
+
+    class OrderRenamingMapper(CopyMapper):
+        # renames the placeholders in the order they are visited
+        def __init__(self):
+            super().__init__()
+            self.names = []
+
+        def map_placeholder(self, expr):
+            self.names.append(expr.name)
+            return pt.make_placeholder(f"renamed_{len(self.names)}",
+                                       expr.shape, expr.dtype)
+
+    x = pt.make_placeholder("x", shape=(6, 4), dtype=np.float64)
+    y = pt.make_placeholder("y", shape=(6, 4), dtype=np.float64)
+    w = pt.make_placeholder("w", shape=(6, 4), dtype=np.float64)
+    u = pt.stack([y, 2*x, pt.roll(w, 1, axis=0)])
+    z = pt.concatenate([u[1], x.T.T]) @ w.T
+    dag = pt.make_dict_of_named_arrays({
+        "u": pt.sum(u.reshape(-1, 2), axis=1),
+        "z": pt.einsum("ij,ij->i", z, z[::-1, ::-1])})
+
+    iterative_mapper = OrderRenamingMapper()
+    recursive_mapper = OrderRenamingMapper()
+    result = copy_dict_of_named_arrays_iterative(dag, iterative_mapper)
+    assert result == copy_dict_of_named_arrays(dag, recursive_mapper)
+    assert iterative_mapper.names == recursive_mapper.names == ["y", "x", "w"]
+
+    # deeper than the recursion limit allows for the recursive copy
+    y = x
+    for _ in range(sys.getrecursionlimit()):
+        y = 2 * y
+    dag = pt.make_dict_of_named_arrays({"out": y})
+
+    result = copy_dict_of_named_arrays_iterative(dag, OrderRenamingMapper())
+    deps = get_dependencies(result)["out"]
+    assert len(deps) == sys.getrecursionlimit() + 1
+    assert ({dep.name for dep in deps if isinstance(dep, Placeholder)}
+            == {"renamed_1"})
+
+
+def test_get_dependencies():
+    from testlib import RandomDAGContext, make_random_dag
+    from pytato.transform import DependencyMapper, get_dependencies
+
+    for i in range(20):
+        rdagc = RandomDAGContext(np.random.default_rng(seed=i),
+                axis_len=5, use_numpy=False)
+        dag = pt.make_dict_of_named_arrays({"a": make_random_dag(rdagc),
+                                            "b": make_random_dag(rdagc)})
+
+        dep_mapper = DependencyMapper()
+        assert get_dependencies(dag) == {name: dep_mapper(val.expr)
+                                         for name, val in dag.items()}
+
+    # deeper than the recursion limit allows for the recursive traversal
+    x = pt.make_placeholder("x", shape=(4,), dtype=np.float64)
+    y = x
+    for _ in range(sys.getrecursionlimit()):
+        y = 2 * y
+    dag = pt.make_dict_of_named_arrays({"out": y})
+
+    deps = DependencyMapper().rec_iterative(y)
+    assert isinstance(deps, frozenset)
+    assert len(deps) == sys.getrecursionlimit() + 1
+    assert deps == get_dependencies(dag)["out"]
+
+
+def test_copy_mapper_shares_unchanged_nodes():
+    from pytato.transform import CopyMapper
+
+    class RenamingMapper(CopyMapper):
+        def map_placeholder(self, expr):
+            if expr.name == "y":
+                return pt.make_placeholder("z", expr.shape, expr.dtype)
+            return super().map_placeholder(expr)
+
+    x = pt.make_placeholder("x", shape=(4,), dtype=np.float64)
+    y = pt.make_placeholder("y", shape=(4,), dtype=np.float64)
+    x_expr = pt.stack([2*x, x[::-1]])
+    expr = x_expr @ y
+
+    assert CopyMapper()(expr) is expr
+
+    result = RenamingMapper()(expr)
+    assert result is not expr
+    assert result.x1 is x_expr
+
+    # tags survive independently of whether the predecessors were rewritten
+    from pytato.tags import ImplStored
+    for ary in (x, y):
+        y_expr = ary[1:].tagged(ImplStored())
+        result = RenamingMapper()(y_expr)
+        assert (result is y_expr) == (ary is x)
+        assert result.tags_of_type(ImplStored)
+
+
 def test_userscollector():
     from testlib import RandomDAGContext, make_random_dag
     from pytato.transform import UsersCollector, reverse_graph